@@ -0,0 +1,226 @@
+import fcntl
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from database import engine
+
+# skkuri.db 온라인 백업
+# SQLite backup API로 페이지를 조금씩 복사하고 단계 사이에 쉬어서, 백업 중에도 요청(쓰기)이 막히지 않게 함.
+# 스냅샷은 gzip으로 압축해서 BACKUP_DIR에 저장하고, 최근 RETENTION개만 남김.
+#
+# 사용법
+#   python backup.py snapshot               지금 스냅샷 생성
+#   python backup.py list                   스냅샷 목록
+#   python backup.py restore [YYYYmmdd-HHMMSS]  해당 시점 이전의 가장 최근 스냅샷으로 복원 (생략시 최신)
+#                                               서버를 멈춘 뒤에만 실행할 수 있음. (메모리의 ETag, 검색/추천 데이터가 db와 어긋나기 때문)
+
+DB_PATH = engine.url.database  # ./skkuri.db
+BACKUP_DIR = './backups'
+RETENTION = 14  # 남길 스냅샷 수
+INTERVAL_HOURS = 24  # 자동 스냅샷 주기. 0이면 사용 안 함.
+PAGES_PER_STEP = 256  # 한번에 복사할 페이지 수
+SLEEP_PER_STEP = 0.02  # 단계 사이에 쉬는 시간(초). 이 사이에 다른 연결이 쓰기를 할 수 있음.
+MAX_RESTARTS = 5  # 복사 중 다른 연결의 쓰기로 처음부터 다시 시작한 횟수가 이보다 많으면
+MAX_SECONDS = 60  # 또는 이 시간이 지나면, 한번에 전체를 복사함 (그동안은 쓰기가 잠깐 기다림)
+RETRY_MINUTES = 10  # 자동 스냅샷 실패시 다시 시도할 때까지 기다리는 시간
+RUNNING_LOCK_PATH = DB_PATH + '.running'  # 서버가 실행중일 때 잡고 있는 lock 파일
+TIME_FORMAT = '%Y%m%d-%H%M%S'
+
+
+class BackupError(Exception):
+    pass
+
+
+def _snapshot_name(time: datetime):
+    return f'skkuri-{time.strftime(TIME_FORMAT)}.db.gz'
+
+
+def _snapshot_time(name: str):
+    try:
+        return datetime.strptime(name[len('skkuri-'):-len('.db.gz')], TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+# 원본 db를 target 경로로 온라인 복사
+# 다른 연결이 쓰기를 하면 SQLite가 복사를 처음부터 다시 시작하므로, 쓰기가 계속 들어오면 끝나지 않을 수 있음.
+# 재시작 횟수나 시간이 제한을 넘으면 한번에 전체를 복사해서 반드시 끝나게 함.
+def _copy_online(source_path, target_path):
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    started = time.monotonic()
+    progress_state = {'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, total):
+        if progress_state['remaining'] is not None and remaining > progress_state['remaining']:
+            progress_state['restarts'] += 1  # 남은 페이지가 늘어남 = 처음부터 다시 시작함
+        progress_state['remaining'] = remaining
+        if progress_state['restarts'] > MAX_RESTARTS or time.monotonic() - started > MAX_SECONDS:
+            raise _TooManyRestarts()
+
+    try:
+        try:
+            source.backup(target, pages=PAGES_PER_STEP, progress=progress, sleep=SLEEP_PER_STEP)
+        except _TooManyRestarts:
+            source.backup(target, pages=-1)
+    finally:
+        target.close()
+        source.close()
+
+
+def _check_integrity(path):
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        conn.close()
+    if result != 'ok':
+        raise BackupError(f'{path} 무결성 검사 실패: {result}')
+
+
+### 스냅샷 목록 (오래된 순)
+def list_snapshots():
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    snapshots = [(_snapshot_time(name), name) for name in os.listdir(BACKUP_DIR)]
+    return sorted((time, os.path.join(BACKUP_DIR, name)) for time, name in snapshots if time is not None)
+
+
+### 스냅샷 생성
+def snapshot():
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    path = os.path.join(BACKUP_DIR, _snapshot_name(datetime.now()))
+
+    with tempfile.TemporaryDirectory(dir=BACKUP_DIR) as tmp_dir:
+        copy_path = os.path.join(tmp_dir, 'skkuri.db')
+        _copy_online(DB_PATH, copy_path)
+        _check_integrity(copy_path)
+
+        with open(copy_path, 'rb') as src, gzip.open(path + '.tmp', 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+    os.replace(path + '.tmp', path)  # 압축이 끝난 파일만 스냅샷 이름을 가짐
+
+    _apply_retention()
+    return path
+
+
+def _apply_retention():
+    snapshots = list_snapshots()
+    for _, path in snapshots[:max(len(snapshots) - RETENTION, 0)]:
+        os.remove(path)
+
+
+### 서버 실행 표시. 서버 프로세스가 살아있는 동안 lock 파일에 공유 lock을 잡고 있음. (프로세스가 끝나면 자동으로 풀림)
+_running_lock = None
+
+
+def mark_running():
+    global _running_lock
+    if _running_lock is None:
+        _running_lock = open(RUNNING_LOCK_PATH, 'a')
+        fcntl.flock(_running_lock, fcntl.LOCK_SH)
+
+
+def _server_running():
+    with open(RUNNING_LOCK_PATH, 'a') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    return False
+
+
+### 복원. point(datetime) 이전의 가장 최근 스냅샷을 사용함. None이면 최신 스냅샷.
+# 서버가 실행중이면 메모리에 있는 데이터(ETag 버전, 검색/추천 인덱스)가 db와 어긋나므로 복원하지 않음.
+def restore(point: datetime | None = None):
+    if _server_running():
+        raise BackupError('서버가 실행중입니다. 서버를 멈춘 뒤 복원해주세요.')
+
+    candidates = [(time, path) for time, path in list_snapshots() if point is None or time <= point]
+    if not candidates:
+        raise BackupError('복원할 스냅샷이 없습니다.')
+    _, path = candidates[-1]
+
+    with tempfile.TemporaryDirectory(dir=BACKUP_DIR) as tmp_dir:
+        copy_path = os.path.join(tmp_dir, 'skkuri.db')
+        with gzip.open(path, 'rb') as src, open(copy_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        _check_integrity(copy_path)  # 검사를 통과한 스냅샷만 복원
+
+        # backup API로 덮어쓰므로 원본 파일이 반쯤 쓰인 상태로 남지 않음
+        _copy_online(copy_path, DB_PATH)
+    return path
+
+
+### 자동 스냅샷. 별도 스레드에서 가장 최근 스냅샷으로부터 INTERVAL_HOURS가 지나면 실행함.
+# 서버가 자주 재시작돼도 스냅샷이 밀리지 않게, 다음 실행 시각은 스냅샷 파일 기준으로 정함.
+class BackupScheduler:
+    def __init__(self, interval_hours=INTERVAL_HOURS):
+        self.interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='skkuri-backup', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _seconds_until_next(self):
+        snapshots = list_snapshots()
+        if not snapshots:
+            return 0
+        newest, _ = snapshots[-1]
+        return max(0.0, self.interval - (datetime.now() - newest).total_seconds())
+
+    def _run(self):
+        while not self._stop.wait(self._seconds_until_next()):
+            try:
+                print(f'백업 완료: {snapshot()}')
+            except (BackupError, OSError, sqlite3.Error) as e:
+                print(f'백업 실패: {e}')
+                if self._stop.wait(RETRY_MINUTES * 60):
+                    break
+
+
+scheduler = BackupScheduler()
+
+
+USAGE = 'usage: python backup.py snapshot | list | restore [YYYYmmdd-HHMMSS]  (restore는 서버를 멈춘 뒤 실행)'
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    try:
+        if command == 'snapshot':
+            print(f'백업 완료: {snapshot()}')
+        elif command == 'list':
+            for snapshot_time, path in list_snapshots():
+                print(f'{snapshot_time.strftime(TIME_FORMAT)}  {path}')
+        elif command == 'restore':
+            try:
+                point = datetime.strptime(sys.argv[2], TIME_FORMAT) if len(sys.argv) > 2 else None
+            except ValueError:
+                print(USAGE)
+                sys.exit(1)
+            print(f'복원 완료: {restore(point)}')
+        else:
+            print(USAGE)
+            sys.exit(1)
+    except BackupError as e:
+        print(e)
+        sys.exit(1)
@@ -0,0 +1,57 @@
+import uuid
+from collections import defaultdict
+
+from fastapi import Request, Response
+from starlette import status
+
+# 동아리 컨텐츠(홍보글, 공지사항, 일정, 작품, 지원서 양식) 버전
+# 운영진이 수정할 때마다 버전을 올리고, 조회 API는 버전으로 ETag를 만듦.
+# If-None-Match가 같으면 DB 조회 없이 304를 리턴함.
+# 버전은 메모리에만 있으므로 서버가 재시작되면 EPOCH가 바뀌어 이전 ETag는 모두 무효가 됨.
+
+EPOCH = uuid.uuid4().hex[:8]
+_versions = defaultdict(int)  # club_id -> 버전
+
+
+# 경로로 들어온 club_id를 정수로 변환. (/notice/01 과 /notice/1 이 같은 버전을 쓰도록) 숫자가 아니면 None.
+def _club_key(club_id):
+    try:
+        return int(club_id)
+    except (TypeError, ValueError):
+        return None
+
+
+# 동아리 컨텐츠가 바뀌었을 때 호출
+def bump(club_id):
+    club_id = _club_key(club_id)
+    if club_id is not None:
+        _versions[club_id] += 1
+
+
+def etag(club_id):
+    return f'"{EPOCH}-{club_id}-{_versions.get(club_id, 0)}"'
+
+
+# 클라이언트가 가진 ETag가 최신인지 확인
+def is_fresh(request: Request, tag: str):
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or tag in candidates or f'W/{tag}' in candidates
+
+
+# 조회 API에서 사용. 최신이면 304 응답을 리턴하고, 아니면 response에 ETag를 붙이고 None을 리턴함.
+# 숫자가 아닌 club_id에는 ETag를 붙이지 않음.
+def not_modified(request: Request, response: Response, club_id):
+    club_id = _club_key(club_id)
+    if club_id is None:
+        return None
+
+    tag = etag(club_id)
+    if is_fresh(request, tag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': tag, 'Cache-Control': 'no-cache'})
+
+    response.headers['ETag'] = tag
+    response.headers['Cache-Control'] = 'no-cache'  # 캐시는 하되 매번 ETag로 확인하게 함
+    return None
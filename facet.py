@@ -0,0 +1,74 @@
+from models import Club
+
+# 동아리 조건 검색(캠퍼스, 대분류, 소분류, 모집중 여부, 이름)용 facet bitmap
+# facet 값마다 해당하는 동아리들을 비트로 표시한 정수를 만들어 두고, 필터와 facet별 개수를 비트 연산으로 계산함.
+# 동아리 정보(모집중 여부 등)가 바뀌면 invalidate()를 호출해서 다음 검색 때 다시 만듦.
+
+FACETS = ['campus', 'main_category', 'sub_category', 'is_recruiting']
+
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class FacetIndex:
+    def __init__(self):
+        self.dirty = True
+        self.club_ids = []  # 비트 번호 -> club id
+        self.names = []  # 비트 번호 -> 동아리명 (이름 검색용)
+        self.all = 0  # 전체 동아리 비트
+        self.bitmaps = {facet: {} for facet in FACETS}  # facet -> {값: 비트}
+
+    def invalidate(self):
+        self.dirty = True
+
+    def build(self, db):
+        columns = [getattr(Club, facet) for facet in FACETS]
+        rows = db.query(Club.id, Club.name, *columns).order_by(Club.id).all()
+
+        self.club_ids = [row.id for row in rows]
+        self.names = [(row.name or '').lower() for row in rows]
+        self.all = (1 << len(rows)) - 1
+        self.bitmaps = {facet: {} for facet in FACETS}
+        for position, row in enumerate(rows):
+            for facet in FACETS:
+                value = getattr(row, facet)
+                if facet == 'is_recruiting':
+                    value = bool(value)
+                if value is None:
+                    continue
+                self.bitmaps[facet][value] = self.bitmaps[facet].get(value, 0) | (1 << position)
+        self.dirty = False
+
+    # filters: {facet: 값 또는 None}, text: 동아리명에 포함될 문자열
+    # 조건에 맞는 club id 목록과 facet별 개수를 리턴함. facet 개수는 해당 facet을 뺀 나머지 조건 기준으로 셈.
+    def search(self, db, filters: dict, text: str | None = None):
+        if self.dirty:
+            self.build(db)
+
+        base = self.all
+        if text:
+            base = sum(1 << position for position, name in enumerate(self.names) if text.lower() in name)
+
+        masks = {facet: self.bitmaps[facet].get(value, 0) for facet, value in filters.items() if value is not None}
+
+        matched = base
+        for mask in masks.values():
+            matched &= mask
+
+        counts = {}
+        for facet in FACETS:
+            others = base
+            for other, mask in masks.items():
+                if other != facet:
+                    others &= mask
+            counts[facet] = {value: (others & bitmap).bit_count() for value, bitmap in self.bitmaps[facet].items()
+                             if others & bitmap}
+
+        return [self.club_ids[position] for position in _bits(matched)], counts
+
+
+facet_index = FacetIndex()
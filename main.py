@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 
+import backup
 import models
+import stats
 from database import engine
-from routers import auth, user, club, activity, application  # todos, admin, users
+from routers import auth, user, club, activity, application, batch, statistics  # todos, admin, users
 
 app = FastAPI(
     title="SKKU-RI API"
@@ -10,6 +12,7 @@ app = FastAPI(
 
 # main.py에서 모든 fastapi 객체들을 관리
 
+stats_tables_missing = stats.tables_missing()  # create_all 전에 확인해야 통계 테이블을 새로 만드는지 알 수 있음
 models.Base.metadata.create_all(bind=engine)  # todos.db가 없을때만 실행됨.
 
 app.include_router(auth.router) # router 를 사용.
@@ -17,5 +20,24 @@ app.include_router(club.router) # router 를 사용.
 app.include_router(user.router) # router 를 사용.
 app.include_router(application.router) # router 를 사용.
 app.include_router(activity.router) # router 를 사용.
+app.include_router(batch.router) # router 를 사용.
+app.include_router(statistics.router) # router 를 사용.
+
+
+@app.on_event("startup")
+def init_stats():  # 통계 집계 테이블이 새로 생긴 경우에만 원본에서 채움 (stats.py)
+    if stats_tables_missing:
+        stats.initialize()
+
+
+@app.on_event("startup")
+def start_backup():  # skkuri.db 자동 백업 시작 (backup.py)
+    backup.mark_running()  # 서버 실행중에는 복원하지 못하게 함
+    backup.scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_backup():
+    backup.scheduler.stop()
 
 # app.include_router(admin.router) # router 를 사용.
@@ -88,3 +88,24 @@ class Artwork(Base):
     img_path = Column(String) # 작품 이미지.
     club_id = Column(Integer, ForeignKey("club.id"))
 
+
+
+# 통계용 집계 테이블. 지원/승인/거부/멤버 추가 시 같이 갱신됨. (stats.py)
+class ClubStats(Base):
+    __tablename__ = 'club_stats'
+
+    club_id = Column(Integer, ForeignKey("club.id"), primary_key=True)
+    applicant_count = Column(Integer, default=0) # 지원서 수
+    approved_count = Column(Integer, default=0) # 승인 수
+    denied_count = Column(Integer, default=0) # 거부 수
+    member_count = Column(Integer, default=0) # 멤버 수 (운영진 포함)
+
+
+class CategoryStats(Base):
+    __tablename__ = 'category_stats'
+
+    main_category = Column(String, primary_key=True)
+    applicant_count = Column(Integer, default=0)
+    approved_count = Column(Integer, default=0)
+    denied_count = Column(Integer, default=0)
+    member_count = Column(Integer, default=0)
@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+from collections import deque, defaultdict
+from itertools import count
+
+# 동아리별 매니저 알림용 in-process pub/sub 허브
+# 지원서 제출/승인/거부 이벤트를 구독중인 매니저에게 바로 전달함. (polling 대체)
+
+QUEUE_SIZE = 64  # 구독자 1명당 최대 대기 이벤트 수
+BUFFER_SIZE = 128  # 재접속시 재전송용 동아리별 최근 이벤트 수
+EPOCH = uuid.uuid4().hex[:8]  # 프로세스마다 바뀌는 값. 이벤트 id는 "{EPOCH}-{번호}" 형태라 재시작 전 id와 섞이지 않음.
+
+
+class Subscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False  # 큐가 가득 차서 끊어야 하는 구독자
+
+
+# 이벤트 id에서 번호를 꺼냄. 다른 프로세스(재시작 전)의 id거나 형식이 틀리면 None.
+def _event_number(event_id: str):
+    epoch, _, number = event_id.partition('-')
+    if epoch != EPOCH or not number.isdigit():
+        return None
+    return int(number)
+
+
+class ClubEventHub:
+    def __init__(self):
+        self._numbers = count(1)  # 이벤트 번호는 프로세스 안에서 증가하는 값
+        self._subscribers = defaultdict(set)  # club_id -> {Subscriber}
+        self._buffers = defaultdict(lambda: deque(maxlen=BUFFER_SIZE))  # club_id -> 최근 (번호, 이벤트) ring buffer
+        self._evicted = {}  # club_id -> ring buffer에서 밀려난 마지막 이벤트 번호
+        self._last_number = 0  # 마지막으로 발행된 이벤트 번호
+
+    # 이벤트 발행. club_id는 Recruit에 저장된 동아리 id를 사용해야 함.
+    def publish(self, club_id, event_type: str, data: dict):
+        try:
+            club_id = int(club_id)
+        except (TypeError, ValueError):
+            return None  # 숫자가 아닌 동아리 id는 구독할 수 없으므로 보낼 곳이 없음
+        number = next(self._numbers)
+        event = {'id': f'{EPOCH}-{number}', 'type': event_type, 'data': data}
+        self._last_number = number
+        buffer = self._buffers[club_id]
+        if len(buffer) == buffer.maxlen:
+            self._evicted[club_id] = buffer[0][0]
+        buffer.append((number, event))
+
+        for subscriber in list(self._subscribers[club_id]):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 느린 구독자는 끊어버림. 재접속할 때 last_event_id로 놓친 이벤트를 다시 받음.
+                subscriber.overflowed = True
+                self._subscribers[club_id].discard(subscriber)
+        return event
+
+    # 구독 시작. last_event_id 이후의 이벤트는 버퍼에서 먼저 채워줌.
+    # 놓친 이벤트를 모두 채워줄 수 없으면 대신 resync 이벤트를 보냄. (클라이언트는 지원자 목록을 다시 조회해야 함)
+    # club_id가 숫자가 아니면 ValueError.
+    def subscribe(self, club_id, last_event_id: str | None = None):
+        club_id = int(club_id)
+        subscriber = Subscriber()
+
+        if last_event_id is not None:
+            buffer = self._buffers[club_id]
+            last_number = _event_number(last_event_id)
+            missed = [event for number, event in buffer if last_number is not None and number > last_number]
+            if last_number is None or last_number < self._evicted.get(club_id, 0) or len(missed) > QUEUE_SIZE:
+                # 서버 재시작 전의 id거나, 버퍼보다 오래됐거나, 큐에 다 못 넣는 경우
+                latest_number = buffer[-1][0] if buffer else self._last_number
+                subscriber.queue.put_nowait({'id': f'{EPOCH}-{latest_number}', 'type': 'resync', 'data': {}})
+            else:
+                for event in missed:
+                    subscriber.queue.put_nowait(event)
+
+        self._subscribers[club_id].add(subscriber)
+        return subscriber
+
+    # 구독 해제
+    def unsubscribe(self, club_id, subscriber: Subscriber):
+        club_id = int(club_id)
+        self._subscribers[club_id].discard(subscriber)
+        if not self._subscribers[club_id]:
+            del self._subscribers[club_id]
+
+
+hub = ClubEventHub()
+
+
+# Recruit 모델을 이벤트용 dict로 변환
+def recruit_event_data(recruit_model):
+    return {
+        'recruit_id': recruit_model.id,
+        'user_id': recruit_model.user_id,
+        'club_id': recruit_model.club_id,
+        'is_approve': recruit_model.is_approve,
+        'content': recruit_model.content,
+    }
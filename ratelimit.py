@@ -0,0 +1,102 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from starlette import status
+
+# 로그인/회원가입/지원서 제출 요청 제한용
+# 키(유저 id, 클라이언트 ip)별 token bucket. 키 개수는 max_keys로 제한하고 오래된 키부터 버림(LRU).
+# 학교 와이파이(NAT)나 프록시 뒤에서는 여러 학생이 같은 ip를 쓰므로, ip만 쓰는 제한은 넉넉하게 잡음.
+# 프록시 뒤에서 실행할 경우 TRUSTED_PROXIES에 프록시 주소를 넣어야 X-Forwarded-For의 실제 클라이언트 ip를 사용함.
+
+
+class RateLimiter:
+    def __init__(self, capacity: int, per_seconds: float, max_keys: int = 10000):
+        self.capacity = capacity  # 한번에 허용되는 최대 요청 수
+        self.rate = capacity / per_seconds  # 초당 채워지는 토큰 수
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (남은 토큰, 마지막 갱신 시각)
+
+    # 요청 1개를 소비. 허용되면 0, 아니면 다시 시도할 수 있을 때까지 남은 초를 리턴함.
+    def hit(self, key) -> float:
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)  # 가장 최근 사용된 키로 맨 뒤에 넣음
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+# 라우트별 정책
+LOGIN_LIMITER = RateLimiter(capacity=10, per_seconds=60)  # (ip, 이메일)당 1분에 10번
+LOGIN_IP_LIMITER = RateLimiter(capacity=120, per_seconds=60)  # ip당 1분에 120번
+SIGNUP_LIMITER = RateLimiter(capacity=60, per_seconds=3600)  # ip당 1시간에 60번
+SUBMIT_IP_LIMITER = RateLimiter(capacity=60, per_seconds=60)  # ip당 1분에 60번
+SUBMIT_USER_LIMITER = RateLimiter(capacity=5, per_seconds=60)  # 유저당 1분에 5번
+
+TRUSTED_PROXIES = {'127.0.0.1', '::1'}  # X-Forwarded-For를 믿을 수 있는 프록시 주소
+
+# bcrypt, DB 쓰기처럼 비싼 라우트의 전체 동시 처리 수
+MAX_EXPENSIVE_REQUESTS = 8
+_expensive_semaphore = asyncio.Semaphore(MAX_EXPENSIVE_REQUESTS)
+
+
+def client_ip(request: Request):
+    if request.client is None:
+        return "unknown"
+    ip = request.client.host
+    if ip not in TRUSTED_PROXIES:
+        return ip
+
+    # 믿을 수 있는 프록시를 거쳐온 경우, 뒤에서부터 처음 나오는 프록시가 아닌 주소가 실제 클라이언트
+    forwarded = [address.strip() for address in request.headers.get('x-forwarded-for', '').split(',') if address.strip()]
+    for address in reversed(forwarded):
+        if address not in TRUSTED_PROXIES:
+            return address
+    return ip
+
+
+# 제한을 넘으면 429 + Retry-After
+def check_rate(limiter: RateLimiter, key):
+    retry_after = limiter.hit(key)
+    if retry_after > 0:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail='요청이 너무 많습니다. 잠시 후 다시 시도해주세요.',
+                            headers={'Retry-After': str(math.ceil(retry_after))})
+
+
+# ip 기준 제한 dependency 생성
+def limit_by_ip(limiter: RateLimiter):
+    async def dependency(request: Request):
+        check_rate(limiter, client_ip(request))
+    return dependency
+
+
+# 로그인 제한 dependency. 같은 ip의 다른 학생들이 막히지 않게 (ip, 이메일) 기준으로 제한함.
+async def limit_login(request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+    ip = client_ip(request)
+    check_rate(LOGIN_IP_LIMITER, ip)
+    check_rate(LOGIN_LIMITER, (ip, form_data.username.lower()))
+
+
+# 비싼 라우트 동시 처리 수 제한 dependency. 자리가 없으면 기다리지 않고 503을 줌.
+async def expensive_slot():
+    if _expensive_semaphore.locked():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.',
+                            headers={'Retry-After': '1'})
+    await _expensive_semaphore.acquire()
+    try:
+        yield
+    finally:
+        _expensive_semaphore.release()
@@ -0,0 +1,143 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+from models import Club
+
+# 비슷한 동아리 추천용
+# 동아리 텍스트(이름, 설명, 활동, 카테고리, 캠퍼스)를 문자 n-gram TF-IDF 벡터로 만들고
+# 동아리끼리의 코사인 유사도 행렬을 한번에 계산해둠. top-k 결과는 캐시함.
+# n-gram 개수는 동아리별 Counter로만 들고 있고, 행렬로는 정규화된 벡터(동아리 x MAX_FEATURES)와 유사도 행렬만 저장함.
+
+NGRAM_RANGE = (2, 3)
+MAX_FEATURES = 4096  # 사용할 n-gram 수 상한. 여러 동아리에 나오는 n-gram부터 사용함.
+MIN_DF = 2  # 한 동아리에만 나오는 n-gram은 유사도에 영향이 없으므로 제외
+DEFAULT_K = 5
+
+
+def club_text(club):
+    fields = [club.name, club.description, club.activity, club.main_category, club.sub_category, club.campus]
+    text = ' '.join(str(field) for field in fields if field)
+    return re.sub(r'\s+', ' ', text.lower()).strip()
+
+
+def char_ngrams(text: str):
+    grams = Counter()
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(text) - n + 1):
+            grams[text[i:i + n]] += 1
+    return grams
+
+
+class ClubRecommender:
+    def __init__(self):
+        self.built = False
+        self.club_ids = []  # 행 번호 -> club id
+        self.rows = {}  # club id -> 행 번호
+        self.grams = []  # 행 번호 -> n-gram Counter (sparse tf)
+        self.vocab = {}  # n-gram -> 열 번호
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.vectors = np.zeros((0, 0), dtype=np.float32)  # 정규화된 tf-idf
+        self.similarity = np.zeros((0, 0), dtype=np.float32)
+        self._top_k = {}  # (행 번호, k) -> [(club id, 점수)]
+
+    # 전체 재계산. vocab과 idf는 여기서만 다시 정함.
+    def build(self, db):
+        clubs = db.query(Club).all()
+        self.club_ids = [club.id for club in clubs]
+        self.rows = {club_id: row for row, club_id in enumerate(self.club_ids)}
+        self.grams = [char_ngrams(club_text(club)) for club in clubs]
+
+        df = Counter()
+        for club_grams in self.grams:
+            df.update(club_grams.keys())
+        features = [gram for gram, count in df.most_common(MAX_FEATURES) if count >= MIN_DF]
+        self.vocab = {gram: column for column, gram in enumerate(features)}
+
+        n = len(clubs)
+        self.idf = np.array([np.log((1 + n) / (1 + df[gram])) + 1 for gram in features], dtype=np.float32)
+        self.vectors = np.stack([self._vector(club_grams) for club_grams in self.grams]) if clubs \
+            else np.zeros((0, len(features)), dtype=np.float32)
+        self.similarity = self.vectors @ self.vectors.T
+        np.fill_diagonal(self.similarity, 0)  # 자기 자신은 제외
+        self._top_k = {}
+        self.built = True
+
+    def ensure_built(self, db):
+        if not self.built:
+            self.build(db)
+
+    # 동아리 하나가 바뀌었을 때 해당 행/열만 다시 계산. vocab과 idf는 rebuild 전까지 유지함.
+    def update_club(self, club):
+        if not self.built:
+            return
+
+        club_grams = char_ngrams(club_text(club))
+        vector = self._vector(club_grams)
+
+        row = self.rows.get(club.id)
+        if row is None:  # 새로 생긴 동아리
+            row = len(self.club_ids)
+            self.club_ids.append(club.id)
+            self.rows[club.id] = row
+            self.grams.append(club_grams)
+            self.vectors = np.vstack([self.vectors, vector])
+            self.similarity = np.pad(self.similarity, ((0, 1), (0, 1)))
+        else:
+            self.grams[row] = club_grams
+            self.vectors[row] = vector
+
+        scores = self.vectors @ vector
+        scores[row] = 0
+        self.similarity[row] = scores
+        self.similarity[:, row] = scores
+
+        # 이 동아리가 들어가거나 빠질 수 있는 캐시만 지움
+        for key, neighbors in list(self._top_k.items()):
+            other, k = key
+            if other == row or any(club_id == club.id for club_id, _ in neighbors) \
+                    or len(neighbors) < k or scores[other] > neighbors[-1][1]:
+                del self._top_k[key]
+
+    # 비슷한 동아리 top-k
+    def similar(self, club_id, k: int = DEFAULT_K):
+        row = self.rows.get(club_id)
+        if row is None:
+            return []
+        key = (row, k)
+        if key not in self._top_k:
+            self._top_k[key] = self._rank(self.similarity[row], k, exclude=[row])
+        return self._top_k[key]
+
+    # 가입한 동아리들과 비슷한 동아리 top-k (가입한 동아리 제외)
+    def recommend(self, club_ids, k: int = DEFAULT_K):
+        rows = sorted({self.rows[club_id] for club_id in club_ids if club_id in self.rows})
+        if not rows:
+            return []
+        scores = self.similarity[rows].sum(axis=0) / len(rows)
+        return self._rank(scores, k, exclude=rows)
+
+    # n-gram Counter -> 정규화된 tf-idf 벡터 (vocab에 없는 n-gram은 무시)
+    def _vector(self, club_grams):
+        vector = np.zeros(len(self.vocab), dtype=np.float32)
+        for gram, count in club_grams.items():
+            column = self.vocab.get(gram)
+            if column is not None:
+                vector[column] = np.log1p(count)  # sublinear tf
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _rank(self, scores, k, exclude):
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+        k = min(k, len(scores) - len(exclude))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.club_ids[row], float(scores[row])) for row in top]
+
+
+recommender = ClubRecommender()
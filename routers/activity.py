@@ -2,7 +2,7 @@ import os
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, Form
+from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, Form, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from starlette import status
@@ -11,8 +11,10 @@ from datetime import timedelta, datetime
 
 from starlette.responses import FileResponse
 
+import content_version
 from database import SessionLocal
 from models import Club, Schedule, Notice, Artwork
+from recommend import recommender
 from routers.application import authentication_manager
 from routers.auth import get_current_user
 
@@ -48,7 +50,11 @@ class ScheduleRequest(BaseModel):
 # 동아리 일정 조회
 @router.get("/schedule/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 일정조회 API",
             description="해당 동아리의 모든 일정을 조회합니다.")
-async def read_schedule_club(db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+async def read_schedule_club(request: Request, response: Response, db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+    cached = content_version.not_modified(request, response, club_id)  # 바뀐 게 없으면 DB 조회 없이 304
+    if cached is not None:
+        return cached
+
     return db.query(Schedule).filter(Schedule.club_id == club_id).all()
 
 
@@ -68,6 +74,7 @@ async def post_schedule_club(db: db_dependency, user: user_dependency, schedule_
 
     db.add(schedule_model)
     db.commit()
+    content_version.bump(club_id)
 
     return "일정이 추가됐습니다."
 
@@ -87,6 +94,7 @@ async def delete_schedule_club(db: db_dependency, user: user_dependency, club_id
 
     db.delete(schedule_model)
     db.commit()
+    content_version.bump(schedule_model.club_id)  # 삭제된 항목이 속한 동아리
 
     return "일정이 삭제됐습니다."
 
@@ -104,7 +112,11 @@ class NoticeRequest(BaseModel):
 
 @router.get("/notice/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 공지사항 조회 API",
             description="해당 동아리의 모든 공지사항을 조회합니다.")
-async def read_notice_club(db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+async def read_notice_club(request: Request, response: Response, db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+    cached = content_version.not_modified(request, response, club_id)  # 바뀐 게 없으면 DB 조회 없이 304
+    if cached is not None:
+        return cached
+
     return db.query(Notice).filter(Notice.club_id == club_id).all()
 
 
@@ -124,6 +136,7 @@ async def post_notice_club(db: db_dependency, user: user_dependency, notice_requ
 
     db.add(notice_model)
     db.commit()
+    content_version.bump(club_id)
 
     return "공지사항이 추가됐습니다."
 
@@ -143,6 +156,7 @@ async def delete_notice_club(db: db_dependency, user: user_dependency, club_id:
 
     db.delete(notice_model)
     db.commit()
+    content_version.bump(notice_model.club_id)  # 삭제된 항목이 속한 동아리
 
     return "공지사항이 삭제됐습니다."
 
@@ -154,7 +168,11 @@ async def delete_notice_club(db: db_dependency, user: user_dependency, club_id:
 # 동아리 작품 조회
 @router.get("/artwork/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 작품 조회 API",
             description="해당 동아리의 모든 작품을 조회합니다.")
-async def read_artwork_club(db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+async def read_artwork_club(request: Request, response: Response, db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+    cached = content_version.not_modified(request, response, club_id)  # 바뀐 게 없으면 DB 조회 없이 304
+    if cached is not None:
+        return cached
+
     return db.query(Artwork).filter(Artwork.club_id == club_id).all()
 
 @router.get("/artwork/image/{imagename}", status_code=status.HTTP_200_OK, summary="동아리 작품 내 이미지 조회 API (사용X)",
@@ -189,6 +207,7 @@ async def post_artwork_club(db: db_dependency, user: user_dependency, file: Uplo
 
     db.add(artwork_model)
     db.commit()
+    content_version.bump(club_id)
 
     return "작품이 추가됐습니다."
 
@@ -208,6 +227,7 @@ async def delete_artwork_club(db: db_dependency, user: user_dependency, club_id:
 
     db.delete(artwork_model)
     db.commit()
+    content_version.bump(artwork_model.club_id)  # 삭제된 항목이 속한 동아리
 
     return "작품이 삭제됐습니다."
 
@@ -221,7 +241,11 @@ class DescriptionRequest(BaseModel):
 # 동아리 홍보글(설명) 조회
 @router.get("/description/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 홍보글(설명) 조회 API",
             description="해당 동아리의 홍보글(설명)을 조회합니다.")
-async def read_description_club(db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+async def read_description_club(request: Request, response: Response, db: db_dependency, club_id: str = Path()):  # db가 열리는 것에 의존함.
+    cached = content_version.not_modified(request, response, club_id)  # 바뀐 게 없으면 DB 조회 없이 304
+    if cached is not None:
+        return cached
+
     return db.query(Club).filter(Club.id == club_id).first().description
 
 # 수정
@@ -236,4 +260,6 @@ async def revise_description_club(db: db_dependency, user: user_dependency, desc
 
     db.add(club_model)
     db.commit()
+    content_version.bump(club_id)
+    recommender.update_club(club_model)  # 추천용 행렬에서 해당 동아리만 다시 계산
     return "홍보글이 수정됐습니다."
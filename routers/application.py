@@ -1,12 +1,19 @@
+import asyncio
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
+from websockets.exceptions import ConnectionClosed
 from sqlalchemy import and_
 from starlette import status
 
 from database import SessionLocal
 from models import Club, Users, Member, ApplicationForm, Recruit
+from notification import hub, recruit_event_data
+import content_version
+from facet import facet_index
+import stats
+from ratelimit import SUBMIT_IP_LIMITER, SUBMIT_USER_LIMITER, limit_by_ip, check_rate, expensive_slot
 
 from routers.auth import get_current_user
 
@@ -35,7 +42,11 @@ user_dependency = Annotated[dict, Depends(get_current_user)]
 
 ### 동아리 지원서 양식 보기
 @router.get("/form/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 지원서 양식 확인 API", description="해당 동아리의 지원서 양식을 확인합니다.")
-async def read_application_form(db: db_dependency, club_id: str=Path()):
+async def read_application_form(request: Request, response: Response, db: db_dependency, club_id: str=Path()):
+    cached = content_version.not_modified(request, response, club_id)  # 바뀐 게 없으면 DB 조회 없이 304
+    if cached is not None:
+        return cached
+
     applicationform_model = db.query(ApplicationForm).filter(ApplicationForm.club_id==club_id).first()
 
     if applicationform_model is None or applicationform_model.content is None:
@@ -44,8 +55,10 @@ async def read_application_form(db: db_dependency, club_id: str=Path()):
     return applicationform_model.content
 
 ### 동아리 지원하기 (동아리 지원서 작성)
-@router.post("/submit/{club_id}", status_code=status.HTTP_200_OK, summary="동아리 지원 API", description="해당 동아리의 지원서 양식에 맞게 지원서를 작성하고 제출합니다. 각 지원서 질문에 대한 답변은 ,로 구분해주시기 바랍니다. ex) 1번답,2번답,3번답")
+@router.post("/submit/{club_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(limit_by_ip(SUBMIT_IP_LIMITER)), Depends(expensive_slot)], summary="동아리 지원 API", description="해당 동아리의 지원서 양식에 맞게 지원서를 작성하고 제출합니다. 각 지원서 질문에 대한 답변은 ,로 구분해주시기 바랍니다. ex) 1번답,2번답,3번답")
 async def submit_application_form(db: db_dependency, user: user_dependency, content: ContentRequest, club_id: str=Path()):
+    check_rate(SUBMIT_USER_LIMITER, user.get("id"))  # 유저 기준 제한
+
     if db.query(Member).filter(and_(Member.club_id==club_id, Member.user_id==user.get("id"))).first() :
         return "이미 해당 동아리의 회원입니다."
     
@@ -56,8 +69,11 @@ async def submit_application_form(db: db_dependency, user: user_dependency, cont
     )
 
     db.add(recruit_model)
+    stats.record_application(db, club_id)
     db.commit()
 
+    hub.publish(recruit_model.club_id, 'submit', recruit_event_data(recruit_model))
+
     return "동아리에 지원했습니다."
 
 
@@ -83,6 +99,8 @@ async def change_recruit(db: db_dependency, user: user_dependency, club_id: str=
 
     db.add(club_model)
     db.commit()
+    content_version.bump(club_id)
+    facet_index.invalidate()  # 모집중 여부가 바뀌었으므로 조건 검색 bitmap을 다시 만듦
 
     return message
 
@@ -102,6 +120,7 @@ async def write_application_form(db: db_dependency, user:user_dependency, conten
 
     db.add(applicationform_model)
     db.commit()
+    content_version.bump(club_id)
 
     return "동아리 지원서 양식을 작성했습니다."
 
@@ -115,6 +134,7 @@ async def write_application_form(db: db_dependency, user:user_dependency, conten
 
     db.delete(applicationform_model)
     db.commit()
+    content_version.bump(club_id)
 
     return "동아리 지원서 양식을 삭제했습니다."
 
@@ -126,6 +146,63 @@ async def read_applicants(db: db_dependency, user: user_dependency, club_id: str
 
     return db.query(Recruit).filter(Recruit.club_id==club_id).all()
 
+### (manager) 동아리 지원자 실시간 알림 받기 (websocket)
+# 연결: ws://.../application/ws/applicants/{club_id}?token={access token}&last_event_id={마지막으로 받은 이벤트 id}
+# 지원서 제출(submit), 승인(admit), 거부(deny) 이벤트를 {"id", "type", "data"} 형태로 보냄.
+@router.websocket("/ws/applicants/{club_id}")
+async def subscribe_applicants(websocket: WebSocket, club_id: str=Path(), token: str=Query(), last_event_id: str | None=Query(None)):
+    if not club_id.isdigit():  # 숫자가 아닌 동아리 id는 구독할 수 없음
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        user = await get_current_user(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    db = SessionLocal()  # 인증할 때만 세션을 열고 바로 닫음.
+    try:
+        is_manager = authentication_manager(db, user, club_id)
+    finally:
+        db.close()
+
+    if is_manager == False:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = hub.subscribe(club_id, last_event_id)
+    receiver = asyncio.create_task(wait_disconnect(websocket))  # 연결이 끊기면 바로 구독을 끝내기 위함
+    try:
+        while not receiver.done():
+            if subscriber.overflowed and subscriber.queue.empty():
+                # 이벤트를 못 따라온 경우. last_event_id로 재접속하도록 끊음.
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+
+            getter = asyncio.ensure_future(subscriber.queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, timeout=30, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                if receiver in done:
+                    break
+                await websocket.send_json({'type': 'ping'})  # 연결 확인용
+                continue
+            await websocket.send_json(getter.result())
+    except (WebSocketDisconnect, ConnectionClosed, OSError):  # 보내는 도중 끊긴 경우 (uvicorn ClientDisconnected는 OSError)
+        pass
+    finally:
+        receiver.cancel()
+        hub.unsubscribe(club_id, subscriber)
+
+# 클라이언트 메시지는 무시하고, 연결이 끊길 때까지 기다림
+async def wait_disconnect(websocket: WebSocket):
+    while True:
+        message = await websocket.receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+
 ### (manager) 동아리 지원자의 지원서 보기
 
 ### (manager) 동아리 지원 승인하기
@@ -135,6 +212,7 @@ async def admit_applicants(db: db_dependency, user: user_dependency, club_id: st
         return "해당 동아리의 운영진이 아닙니다."
 
     recruit_model = db.query(Recruit).filter(and_(Recruit.id==recruit_id)).first()
+    stats.record_decision(db, recruit_model.club_id, recruit_model.is_approve, True)
     recruit_model.is_approve=True
 
     member_model = Member(
@@ -145,8 +223,11 @@ async def admit_applicants(db: db_dependency, user: user_dependency, club_id: st
 
     db.add(recruit_model)
     db.add(member_model)
+    stats.record_member(db, club_id)
     db.commit()
 
+    hub.publish(recruit_model.club_id, 'admit', recruit_event_data(recruit_model))
+
     return "해당 유저는 승인됐습니다."
 
 ### (manager) 동아리 지원 거부하기
@@ -157,11 +238,14 @@ async def admit_applicants(db: db_dependency, user: user_dependency, club_id: st
         return "해당 동아리의 운영진이 아닙니다."
 
     recruit_model = db.query(Recruit).filter(and_(Recruit.id == recruit_id)).first()
+    stats.record_decision(db, recruit_model.club_id, recruit_model.is_approve, False)
     recruit_model.is_approve = False
 
     db.add(recruit_model)
     db.commit()
 
+    hub.publish(recruit_model.club_id, 'deny', recruit_event_data(recruit_model))
+
     return "해당 유저는 거부됐습니다."
 
 ### (manager) 가입된 회원 현황 및 정보 보기
@@ -183,6 +267,7 @@ def club_add_member(user_id, club_id, db):
     )
 
     db.add(member_model)
+    stats.record_member(db, club_id)
     db.commit()
 
 ### 동아리 매니저 확인
@@ -10,6 +10,9 @@ from passlib.context import CryptContext
 from starlette import status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer  # OAUTH2 비번
 from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
+
+from ratelimit import SIGNUP_LIMITER, limit_by_ip, limit_login, expensive_slot
 
 router = APIRouter(
     prefix='/auth',  # 접두사
@@ -70,7 +73,7 @@ def create_access_token(email: str, user_id: int, expires_delta: timedelta):
 #
 ### 유저 생성 API
 #
-@router.post("/create", status_code=status.HTTP_201_CREATED, summary="신규 유저 등록(회원가입) API", description="유저 정보를 입력할 경우, 유저를 생성하여 DB에 저장하는 API입니다.")
+@router.post("/create", status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_by_ip(SIGNUP_LIMITER)), Depends(expensive_slot)], summary="신규 유저 등록(회원가입) API", description="유저 정보를 입력할 경우, 유저를 생성하여 DB에 저장하는 API입니다.")
 async def create_user(db: db_dependency, create_user_request: CreateUserRequest):
     user_model = db.query(Users).filter(Users.email == create_user_request.email).first() # 유저 존재 확인
 
@@ -81,7 +84,7 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
         email=create_user_request.email,
         nickname=create_user_request.nickname,
         department=create_user_request.department,
-        hashed_password=bcrypt_context.hash(create_user_request.password),  # hash
+        hashed_password=await run_in_threadpool(bcrypt_context.hash, create_user_request.password),  # hash (이벤트 루프를 막지 않게 스레드에서)
         student_number=create_user_request.student_number,
         phone_num=create_user_request.phone_num
     )
@@ -109,11 +112,11 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
 #
 ### OAUTH2 FORM 기반으로 로그인 인증 API
 #
-@router.post("/token", response_model=Token, summary="로그인 인증 API", description="OAUTH2 기반입니다. username에 email을, password에 password를 입력할 경우, JWT 토큰을 리턴합니다. 해당 토큰은 header의 authorization 속성에서 사용할 수 있습니다.")
+@router.post("/token", response_model=Token, dependencies=[Depends(limit_login), Depends(expensive_slot)], summary="로그인 인증 API", description="OAUTH2 기반입니다. username에 email을, password에 password를 입력할 경우, JWT 토큰을 리턴합니다. 해당 토큰은 header의 authorization 속성에서 사용할 수 있습니다.")
 async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency):
     # 오직 사용자가 입력할 값은 username과 비밀번호가 전부.
     # 사용자 이름 기반으로 유저 가져오기
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await run_in_threadpool(authenticate_user, form_data.username, form_data.password, db)
     if not user:
         return 'Failed Authentication'
 
@@ -0,0 +1,145 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Annotated
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Match
+
+from database import SessionLocal
+from routers import auth, club, user, activity, application, statistics
+from routers.auth import get_current_user
+
+router = APIRouter(
+    prefix='/batch',
+    tags=['묶음 요청 관련']
+)
+
+
+def get_db():  # db 정보를 fetch 한다음 close하는 함수.
+    db = SessionLocal()
+    try:
+        yield db  # db를 전달함.
+    finally:
+        db.close()
+
+
+db_dependency = Annotated[Session, Depends(get_db)]
+
+MAX_SUB_REQUESTS = 20  # 한번에 보낼 수 있는 최대 요청 수
+
+# 각 router의 get_db. 하위 요청에서는 묶음 요청의 세션 하나를 같이 씀.
+DB_DEPENDENCIES = {auth.get_db, club.get_db, user.get_db, activity.get_db, application.get_db, statistics.get_db, get_db}
+
+
+class SubRequest(BaseModel):
+    path: str  # ex) /activity/notice/1, /club/similar/1?k=3
+
+
+class BatchRequest(BaseModel):
+    requests: list[SubRequest] = Field(min_length=1, max_length=MAX_SUB_REQUESTS)
+
+
+#
+### 묶음 조회 API
+#
+@router.post("", status_code=status.HTTP_200_OK, summary="묶음 조회 API", description="여러 GET API 요청(requests의 path)을 한번에 처리하고, 각 요청의 status와 body를 순서대로 리턴합니다. 모든 요청은 같은 access token과 DB 세션을 사용합니다.")
+async def batch_requests(request: Request, db: db_dependency, batch_request: BatchRequest):
+    principal = None  # access token은 한번만 확인함
+    authorization = request.headers.get('authorization')
+    if authorization and authorization.lower().startswith('bearer '):
+        try:
+            principal = await get_current_user(authorization[7:])
+        except HTTPException:
+            principal = None
+
+    sync_lock = asyncio.Lock()  # 동기 라우트 함수는 스레드에서 실행되므로, 세션을 같이 쓰지 않게 하나씩 실행함
+    return await asyncio.gather(*[
+        run_sub_request(request, db, principal, sync_lock, sub_request.path) for sub_request in batch_request.requests
+    ])
+
+
+### 함수
+
+### 하위 GET 요청 하나를 라우트 함수로 직접 처리
+async def run_sub_request(request: Request, db, principal, sync_lock: asyncio.Lock, path: str):
+    url = urlsplit(path)
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': url.path,
+        'root_path': request.scope.get('root_path', ''),
+        'query_string': url.query.encode(),
+        'headers': [(name, value) for name, value in request.scope['headers'] if name != b'if-none-match'],  # 하위 요청은 항상 body를 받음
+        'client': request.scope.get('client'),
+        'app': request.app,
+    }
+
+    route, child_scope = find_route(request.app, scope)
+    if route is None:
+        return {'path': path, 'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': 'Not Found'}}
+
+    async with AsyncExitStack() as stack:
+        sub_request = Request({**scope, **child_scope, 'fastapi_astack': stack})
+        try:
+            values, errors, _, _, _ = await solve_dependencies(
+                request=sub_request,
+                dependant=route.dependant,
+                dependency_overrides_provider=request.app,
+                dependency_cache=shared_dependency_cache(route.dependant, db, principal),
+            )
+            if errors:
+                raise RequestValidationError(errors)
+
+            if asyncio.iscoroutinefunction(route.endpoint):
+                content = await route.endpoint(**values)
+            else:
+                async with sync_lock:
+                    content = await run_in_threadpool(route.endpoint, **values)
+        except HTTPException as e:
+            return {'path': path, 'status': e.status_code, 'body': {'detail': e.detail}}
+        except RequestValidationError as e:
+            return {'path': path, 'status': status.HTTP_422_UNPROCESSABLE_ENTITY, 'body': {'detail': jsonable_encoder(e.errors())}}
+        except Exception:
+            # 하나가 실패해도 나머지 요청은 계속 처리함. 실패한 요청이 남긴 트랜잭션은 되돌림.
+            db.rollback()
+            return {'path': path, 'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': {'detail': 'Internal Server Error'}}
+
+        if isinstance(content, Response):  # 파일 응답 등은 묶음 요청에서 지원하지 않음
+            return {'path': path, 'status': status.HTTP_400_BAD_REQUEST, 'body': {'detail': '묶음 요청에서 지원하지 않는 API입니다.'}}
+
+        return {'path': path, 'status': route.status_code or status.HTTP_200_OK, 'body': jsonable_encoder(content)}
+
+
+### GET 라우트 찾기
+def find_route(app, scope):
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or 'GET' not in route.methods:
+            continue
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return route, child_scope
+    return None, None
+
+
+### get_db, get_current_user 결과를 미리 채운 dependency cache
+def shared_dependency_cache(dependant, db, principal):
+    cache = {}
+    pending = list(dependant.dependencies)
+    while pending:
+        sub_dependant = pending.pop()
+        if sub_dependant.call in DB_DEPENDENCIES:
+            cache[sub_dependant.cache_key] = db
+        elif sub_dependant.call is get_current_user and principal is not None:
+            cache[sub_dependant.cache_key] = principal
+        pending.extend(sub_dependant.dependencies)
+    return cache
@@ -1,12 +1,14 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from starlette import status
 from sqlalchemy import and_
 
 from database import SessionLocal
-from models import Club
+from models import Club, Member
+from recommend import recommender
+from facet import facet_index
 from routers.auth import get_current_user
 
 
@@ -64,3 +66,35 @@ async def search_maincategory_clubs(db: db_dependency, main_category: str = Path
 @router.get("/search/category/{main_category}/{sub_category}", status_code=status.HTTP_200_OK, summary="동아리 직접검색 API", description="해당 카테고리(main_category, sub_category)에 해당하는 모든 동아리를 출력합니다.\nmain_category에는 '인문사회, 학술, 스포츠' 등이 있고, sub_category에는 '영어, 광고, 한국상경학회' 등이 있습니다.")
 async def search_category_clubs(db: db_dependency, main_category: str = Path(), sub_category: str = Path()):  # db가 열리는 것에 의존함.
     return db.query(Club).filter(and_(Club.main_category==main_category, Club.sub_category==sub_category)).all()
+
+# 동아리 조건 검색
+@router.get("/browse", status_code=status.HTTP_200_OK, summary="동아리 조건 검색 API", description="캠퍼스(campus), 메인 카테고리(main_category), 서브 카테고리(sub_category), 모집중 여부(is_recruiting), 이름(name)을 원하는 만큼 조합해서 동아리를 검색합니다. 결과(clubs)와 함께 각 조건 값별 동아리 수(facets)를 출력합니다.")
+async def browse_clubs(db: db_dependency, campus: str | None = Query(None), main_category: str | None = Query(None), sub_category: str | None = Query(None),
+                       is_recruiting: bool | None = Query(None), name: str | None = Query(None)):  # db가 열리는 것에 의존함.
+    filters = {'campus': campus, 'main_category': main_category, 'sub_category': sub_category, 'is_recruiting': is_recruiting}
+    club_ids, facets = facet_index.search(db, filters, name)
+
+    clubs = db.query(Club).filter(Club.id.in_(club_ids)).order_by(Club.id).all() if club_ids else []
+    return {'clubs': clubs, 'facets': facets}
+
+# 비슷한 동아리 추천
+@router.get("/similar/{club_id}", status_code=status.HTTP_200_OK, summary="비슷한 동아리 추천 API", description="해당 동아리(club_id)와 설명, 활동, 카테고리, 캠퍼스가 비슷한 동아리를 최대 k개 출력합니다.")
+async def read_similar_clubs(db: db_dependency, club_id: int = Path(), k: int = Query(5, ge=1, le=50)):  # db가 열리는 것에 의존함.
+    recommender.ensure_built(db)
+    return similar_clubs_response(db, recommender.similar(club_id, k))
+
+# 가입한 동아리 기반 추천
+@router.get("/recommend", status_code=status.HTTP_200_OK, summary="맞춤 동아리 추천 API", description="access token의 유저가 가입한 동아리들과 비슷한 동아리를 최대 k개 출력합니다. 가입한 동아리는 제외됩니다.")
+async def read_recommended_clubs(db: db_dependency, user: user_dependency, k: int = Query(5, ge=1, le=50)):
+    recommender.ensure_built(db)
+    club_ids = [member.club_id for member in db.query(Member.club_id).filter(Member.user_id == user.get('id')).all()]
+    return similar_clubs_response(db, recommender.recommend(club_ids, k))
+
+### 함수
+
+### 추천 결과(club id, 점수)를 동아리 정보로 변환
+def similar_clubs_response(db, ranked):
+    if not ranked:
+        return []
+    clubs = {club.id: club for club in db.query(Club).filter(Club.id.in_([club_id for club_id, _ in ranked])).all()}
+    return [{'club': clubs[club_id], 'score': score} for club_id, score in ranked if club_id in clubs]
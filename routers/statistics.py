@@ -0,0 +1,48 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Path
+from sqlalchemy.orm import Session
+from starlette import status
+
+import stats
+from database import SessionLocal
+from models import ClubStats, CategoryStats
+from routers.application import authentication_manager
+from routers.auth import get_current_user
+
+
+router = APIRouter(
+    prefix='/stats',
+    tags=['동아리 지원 통계 관련']
+)
+
+def get_db():  # db 정보를 fetch 한다음 close하는 함수.
+    db = SessionLocal()
+    try:
+        yield db  # db를 전달함.
+    finally:
+        db.close()
+
+
+db_dependency = Annotated[Session, Depends(get_db)]
+user_dependency = Annotated[dict, Depends(get_current_user)]
+
+# 통계 관련. 모두 집계 테이블에서 한 줄씩만 읽음.
+
+
+### (manager) 동아리 지원 통계
+@router.get("/club/{club_id}", status_code=status.HTTP_200_OK, summary="[MANAGER] 동아리 지원 통계 API", description="해당 동아리의 지원서 수, 승인/거부/대기 수, 멤버 수를 확인합니다.")
+async def read_club_stats(db: db_dependency, user: user_dependency, club_id: str=Path()):
+    if authentication_manager(db, user, club_id)==False:
+        return "해당 동아리의 운영진이 아닙니다."
+
+    return stats.stats_response(db.query(ClubStats).filter(ClubStats.club_id==club_id).first())
+
+### 전체 카테고리별 지원 통계
+@router.get("/category", status_code=status.HTTP_200_OK, summary="카테고리별 지원 통계 API", description="메인 카테고리별 지원서 수, 승인/거부/대기 수, 멤버 수를 확인합니다.")
+async def read_all_category_stats(db: db_dependency):
+    return {row.main_category: stats.stats_response(row) for row in db.query(CategoryStats).all()}
+
+### 카테고리 지원 통계
+@router.get("/category/{main_category}", status_code=status.HTTP_200_OK, summary="카테고리 지원 통계 API", description="해당 메인 카테고리(main_category)의 지원서 수, 승인/거부/대기 수, 멤버 수를 확인합니다.")
+async def read_category_stats(db: db_dependency, main_category: str=Path()):
+    return stats.stats_response(db.query(CategoryStats).filter(CategoryStats.main_category==main_category).first())
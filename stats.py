@@ -0,0 +1,167 @@
+import sys
+from collections import defaultdict
+
+from sqlalchemy import func, inspect, text
+
+from database import SessionLocal, engine
+from models import Base, Club, Recruit, Member, ClubStats, CategoryStats
+
+# 동아리/카테고리별 지원 통계
+# 지원, 승인, 거부, 멤버 추가가 일어날 때 집계 테이블의 카운터를 같이 올리고 내림. (commit은 호출한 쪽에서)
+# 집계가 맞는지 확인하려면: python stats.py rebuild
+
+COUNTERS = ['applicant_count', 'approved_count', 'denied_count', 'member_count']
+
+
+# 경로로 들어온 club_id를 정수로 변환. 숫자가 아니면 존재할 수 없는 동아리이므로 None.
+def _club_key(club_id):
+    try:
+        return int(club_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _category_of(db, club_id):
+    club_model = db.query(Club.main_category).filter(Club.id == club_id).first()
+    if club_model is None or club_model.main_category is None:
+        return ''
+    return club_model.main_category
+
+
+# 카운터 증가. UPDATE ... SET x = x + n 으로 처리해서 동시 요청에서도 값이 유실되지 않음.
+def _increment(db, club_id, **deltas):
+    club_id = _club_key(club_id)
+    if club_id is None:
+        return
+
+    for model, key_column, key in [(ClubStats, ClubStats.club_id, club_id),
+                                   (CategoryStats, CategoryStats.main_category, _category_of(db, club_id))]:
+        values = {getattr(model, name): getattr(model, name) + delta for name, delta in deltas.items()}
+        if db.query(model).filter(key_column == key).update(values, synchronize_session=False) == 0:
+            row = model(**{key_column.key: key}, **{name: 0 for name in COUNTERS})
+            for name, delta in deltas.items():
+                setattr(row, name, delta)
+            db.add(row)
+            db.flush()
+
+
+### 지원서 제출
+def record_application(db, club_id):
+    _increment(db, club_id, applicant_count=1)
+
+
+### 승인/거부. before, after는 Recruit.is_approve 값 (None, True, False)
+def record_decision(db, club_id, before, after):
+    deltas = defaultdict(int)
+    if before is True:
+        deltas['approved_count'] -= 1
+    elif before is False:
+        deltas['denied_count'] -= 1
+    if after is True:
+        deltas['approved_count'] += 1
+    elif after is False:
+        deltas['denied_count'] += 1
+
+    deltas = {name: delta for name, delta in deltas.items() if delta != 0}
+    if deltas:
+        _increment(db, club_id, **deltas)
+
+
+### 멤버 추가/삭제
+def record_member(db, club_id, delta=1):
+    _increment(db, club_id, member_count=delta)
+
+
+### 조회
+def stats_response(row):
+    counts = {name: (getattr(row, name) or 0) if row is not None else 0 for name in COUNTERS}
+    counts['pending_count'] = counts['applicant_count'] - counts['approved_count'] - counts['denied_count']
+    return counts
+
+
+### 원본 테이블(Recruit, Member)에서 집계를 다시 계산. 기존 집계와 다른 값을 리턴함.
+# 서버가 실행중일 때도 쓸 수 있게, 처음 읽기 전부터 쓰기 lock(BEGIN IMMEDIATE)을 잡고 한 트랜잭션으로 처리함.
+# 그래서 중간에 다른 요청이 카운터를 올려서 값이 유실되는 일이 없음. (db는 새로 연 세션이어야 함)
+def rebuild(db):
+    db.execute(text('BEGIN IMMEDIATE'))
+    try:
+        mismatches = _rebuild(db)
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    return mismatches
+
+
+def _rebuild(db):
+    club_counts = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    recruit_rows = db.query(Recruit.club_id, Recruit.is_approve, func.count(Recruit.id)) \
+        .group_by(Recruit.club_id, Recruit.is_approve).all()
+    for club_id, is_approve, count in recruit_rows:
+        club_counts[club_id]['applicant_count'] += count
+        if is_approve is True:
+            club_counts[club_id]['approved_count'] += count
+        elif is_approve is False:
+            club_counts[club_id]['denied_count'] += count
+
+    for club_id, count in db.query(Member.club_id, func.count(Member.id)).group_by(Member.club_id).all():
+        club_counts[club_id]['member_count'] += count
+
+    club_counts = {_club_key(club_id): counts for club_id, counts in club_counts.items() if _club_key(club_id) is not None}
+    categories = dict(db.query(Club.id, Club.main_category).all())
+    category_counts = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for club_id, counts in club_counts.items():
+        category = categories.get(club_id) or ''
+        for name in COUNTERS:
+            category_counts[category][name] += counts[name]
+
+    mismatches = []
+    for model, key_name, expected in [(ClubStats, 'club_id', club_counts),
+                                      (CategoryStats, 'main_category', category_counts)]:
+        columns = [getattr(model, name) for name in COUNTERS]
+        current = {row[0]: {name: value or 0 for name, value in zip(COUNTERS, row[1:])}
+                   for row in db.query(getattr(model, key_name), *columns).all()}
+        for key in current.keys() | expected.keys():
+            before = current.get(key, dict.fromkeys(COUNTERS, 0))
+            after = expected.get(key, dict.fromkeys(COUNTERS, 0))
+            if before != after:
+                mismatches.append((model.__tablename__, key, before, after))
+
+        db.query(model).delete(synchronize_session=False)
+        for key, counts in expected.items():
+            db.add(model(**{key_name: key}, **counts))
+
+    db.flush()
+    return mismatches
+
+
+### 집계 테이블이 아직 없는지 확인. create_all 전에 불러야 새로 만들어진 테이블인지 알 수 있음.
+def tables_missing():
+    return not inspect(engine).has_table(ClubStats.__tablename__)
+
+
+### 집계 테이블을 새로 만들었을 때 (처음 배포할 때) 원본에서 채움
+def initialize():
+    db = SessionLocal()
+    try:
+        rebuild(db)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['rebuild']:
+        print('usage: python stats.py rebuild')
+        sys.exit(1)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        mismatches = rebuild(db)
+    finally:
+        db.close()
+
+    for table, key, before, after in mismatches:
+        print(f'{table} {key}: {before} -> {after}')
+    print(f'집계를 다시 계산했습니다. 다른 값: {len(mismatches)}개')